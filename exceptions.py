@@ -2,3 +2,17 @@ class SendMessageError(Exception):
     """Ошибка отправки сообщения в тг-чат."""
 
     pass
+
+
+class APIRequestError(Exception):
+    """Ошибка запроса к API-сервису."""
+
+    pass
+
+
+class TooManyRequestsError(APIRequestError):
+    """API-сервис ограничил частоту запросов."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
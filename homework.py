@@ -1,17 +1,21 @@
 import sys
 import logging
 import os
+import random
 
 import requests
 import time
 import telegram
 
+from collections import OrderedDict
 from dotenv import load_dotenv
 from http import HTTPStatus
-from requests.exceptions import RequestException
+from requests.exceptions import RequestException, Timeout
 from telegram.error import TelegramError
 
-from exceptions import SendMessageError
+from exceptions import (
+    APIRequestError, SendMessageError, TooManyRequestsError
+)
 
 load_dotenv()
 
@@ -29,14 +33,28 @@ TELEGRAM_CHAT_ID = os.getenv('TG_CHAT_ID')
 
 RETRY_PERIOD = 600
 CYCLE_UPDATE_TIME_IN_SECONDS = RETRY_PERIOD
+MAX_RETRY_PERIOD = 3600
+MAX_RETRY_EXPONENT = 3
+RETRY_JITTER = 60
+SENT_STATUSES_LIMIT = 1024
+TELEGRAM_MESSAGE_LIMIT = 4096
+MESSAGE_SEPARATOR = '\n\n'
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': 'OAuth {}'.format(PRACTICUM_TOKEN)}
+REQUEST_TIMEOUT = (5, 30)
+
+_PARAMS = {'from_date': 0}
 
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+_VERDICT_TEMPLATES = {
+    status: 'Изменился статус проверки работы "%s". ' + verdict
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
+_VALID_STATUSES = frozenset(HOMEWORK_VERDICTS)
 
 
 def check_tokens():
@@ -63,29 +81,43 @@ def send_message(bot, message):
         bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
     except TelegramError:
         raise SendMessageError('Ошибка отправки сообщения в Telegram')
-    logging.debug('Бот отправил сообщение: {}'.format(message))
+    logging.debug('Бот отправил сообщение: %s', message)
 
 
 def get_api_answer(timestamp):
     """Запрос к эндпоинту API-сервиса."""
+    _PARAMS['from_date'] = timestamp
     try:
         response = requests.get(
             ENDPOINT,
-            params={'from_date': timestamp},
-            headers=HEADERS
+            params=_PARAMS,
+            headers=HEADERS,
+            timeout=REQUEST_TIMEOUT
+        )
+    except Timeout as error_timeout:
+        raise APIRequestError(
+            'Превышено время ожидания ответа API при запросе к URL: {} '
+            'с параметрами: {}. Сообщение: {}'.format(
+                ENDPOINT, timestamp, error_timeout
+            )
         )
     except RequestException as error_connection:
-        raise error_connection(
+        raise APIRequestError(
             'Ошибка связи с API при запросе к URL: {} с параметрами: {}. '
             'Сообщение: {}'.format(ENDPOINT, timestamp, error_connection)
         )
+    if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        retry_after = response.headers.get('Retry-After')
+        raise TooManyRequestsError(
+            'API ограничил частоту запросов. Retry-After: {}.'
+            .format(retry_after),
+            int(retry_after) if str(retry_after).isdigit() else None
+        )
     if response.status_code != HTTPStatus.OK:
-        raise ValueError(
+        raise APIRequestError(
             'Ошибка при запросе к API. HTTP Status Code: {}. '
             'URL: {}. Параметры: {}.'.format(
-                response.status_code,
-                response.url,
-                response.request.params
+                response.status_code, ENDPOINT, _PARAMS
             )
         )
     return response.json()
@@ -93,14 +125,15 @@ def get_api_answer(timestamp):
 
 def check_response(response):
     """Проверка ответа API на соответствие документации."""
-    key_from_api = response['homeworks'] if 'homeworks' in response else None
-    if not isinstance(response, dict):
-        raise TypeError('Ответ API не является словарем.')
-    if 'homeworks' not in response:
-        raise KeyError('Ответ API не содержит ключ "homeworks".')
-    if not isinstance(key_from_api, list):
+    try:
+        homeworks = response['homeworks']
+    except (TypeError, KeyError):
+        if not isinstance(response, dict):
+            raise TypeError('Ответ API не является словарем.') from None
+        raise KeyError('Ответ API не содержит ключ "homeworks".') from None
+    if type(homeworks) is not list:
         raise TypeError('Данные под ключом "homeworks" не являются списком.')
-    return key_from_api
+    return homeworks
 
 
 def parse_status(homework):
@@ -109,49 +142,115 @@ def parse_status(homework):
         raise KeyError('В ответе API отсутствует ключ "homework_name".')
     homework_name = homework['homework_name']
     status = homework.get('status')
-    if status not in HOMEWORK_VERDICTS:
+    if status not in _VALID_STATUSES:
         raise ValueError(
             'Неизвестный статус домашней работы: {}'
             .format(status)
         )
-    verdict = HOMEWORK_VERDICTS[status]
+    return _VERDICT_TEMPLATES[status] % homework_name
+
+
+def is_new_status(sent_statuses, homework):
+    """Проверка, отличается ли статус работы от уже отправленного."""
+    key = homework.get('id', homework.get('homework_name'))
     return (
-        'Изменился статус проверки работы "{}". {}'
-        .format(homework_name, verdict)
+        key not in sent_statuses
+        or sent_statuses[key] != homework.get('status')
     )
 
 
+def remember_status(sent_statuses, homework):
+    """Сохранение отправленного статуса работы с ограничением размера."""
+    key = homework.get('id', homework.get('homework_name'))
+    sent_statuses[key] = homework.get('status')
+    sent_statuses.move_to_end(key)
+    if len(sent_statuses) > SENT_STATUSES_LIMIT:
+        sent_statuses.popitem(last=False)
+
+
+def send_batch(bot, batch, sent_statuses):
+    """Отправка пачки статусов одним сообщением в тг-чат."""
+    send_message(
+        bot, MESSAGE_SEPARATOR.join(message for _, message in batch)
+    )
+    for homework, _ in batch:
+        remember_status(sent_statuses, homework)
+
+
+def send_new_statuses(bot, homeworks, sent_statuses):
+    """Отправка изменившихся статусов работ минимумом сообщений."""
+    batch = []
+    batch_length = 0
+    for homework in homeworks:
+        if not is_new_status(sent_statuses, homework):
+            continue
+        try:
+            message = parse_status(homework)
+        except (KeyError, ValueError) as error_status:
+            logging.error('Ошибка обработки статуса работы: %s', error_status)
+            continue
+        new_length = batch_length + len(message)
+        if batch:
+            new_length += len(MESSAGE_SEPARATOR)
+        if batch and new_length > TELEGRAM_MESSAGE_LIMIT:
+            send_batch(bot, batch, sent_statuses)
+            batch = []
+            new_length = len(message)
+        batch.append((homework, message))
+        batch_length = new_length
+    if batch:
+        send_batch(bot, batch, sent_statuses)
+
+
+def get_retry_delay(attempt, retry_after=None):
+    """Расчет паузы перед повторным запросом после ошибки."""
+    delay = RETRY_PERIOD * 2 ** min(attempt, MAX_RETRY_EXPONENT)
+    if attempt:
+        delay += random.uniform(0, RETRY_JITTER)
+    delay = min(delay, MAX_RETRY_PERIOD)
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
 def main():
     """Основная логика работы бота."""
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
     last_error_message = None
+    error_count = 0
+    sent_statuses = OrderedDict()
 
     while True:
         logging.debug('Начало работы бота.')
+        iteration_start = time.monotonic()
+        retry_delay = CYCLE_UPDATE_TIME_IN_SECONDS
         try:
             api_data = get_api_answer(timestamp)
+            error_count = 0
             if api_data:
                 homeworks = check_response(api_data)
                 if not homeworks:
                     logging.debug('Новых статусов нет.')
-                for homework in homeworks:
-                    message = parse_status(homework)
-                    if message:
-                        send_message(bot, message)
+                send_new_statuses(bot, homeworks, sent_statuses)
                 logging.debug('Обновление временной метки timestamp.')
                 timestamp = api_data.get('current_date', int(time.time()))
                 logging.debug('Конец цикла.')
-            time.sleep(CYCLE_UPDATE_TIME_IN_SECONDS)
-        except Exception as error_programm:
-            logging.exception(
-                'Сбой в работе программы: {}'.format(error_programm)
+        except APIRequestError as error_api:
+            logging.error('Сбой запроса к API: %s', error_api)
+            retry_delay = get_retry_delay(
+                error_count, getattr(error_api, 'retry_after', None)
             )
+            error_count += 1
+        except Exception as error_programm:
+            logging.exception('Сбой в работе программы: %s', error_programm)
             message = 'Сбой в работе программы: {}'.format(error_programm)
             if last_error_message != message:
                 last_error_message = message
-            time.sleep(CYCLE_UPDATE_TIME_IN_SECONDS)
+        elapsed = int(time.monotonic() - iteration_start)
+        sleep_time = max(0, retry_delay - elapsed)
+        time.sleep(sleep_time)
         logging.debug('Конец итерации.')
 
 
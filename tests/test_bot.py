@@ -9,6 +9,7 @@ import pytest
 import requests
 import telegram
 
+import exceptions
 import utils
 
 old_sleep = time.sleep
@@ -772,6 +773,353 @@ class TestHomework:
                     'возникновении ошибки отправки сообщения в Телеграм.'
                 ) from e
 
+    def test_request_timeout(self, monkeypatch, current_timestamp,
+                             homework_module):
+        def check_request_timeout(url, **kwargs):
+            assert 'timeout' in kwargs, (
+                'Проверьте, что в запросе к API передан параметр `timeout`.'
+            )
+            assert kwargs['timeout'] == homework_module.REQUEST_TIMEOUT, (
+                'Проверьте, что в запросе к API передан `REQUEST_TIMEOUT`.'
+            )
+            return utils.MockResponseGET(
+                url, random_timestamp=current_timestamp, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', check_request_timeout)
+        homework_module.get_api_answer(current_timestamp)
+
+    def test_get_api_answer_with_timeout(self, monkeypatch,
+                                         current_timestamp,
+                                         homework_module):
+        def mock_request_get_with_timeout(*args, **kwargs):
+            raise requests.exceptions.Timeout('Timed out')
+
+        monkeypatch.setattr(requests, 'get', mock_request_get_with_timeout)
+        with pytest.raises(exceptions.APIRequestError):
+            homework_module.get_api_answer(current_timestamp)
+
+    def test_get_retry_delay(self, homework_module):
+        func_name = 'get_retry_delay'
+        utils.check_function(homework_module, func_name, 2)
+
+        assert homework_module.get_retry_delay(0) == self.RETRY_PERIOD, (
+            'Убедитесь, что после первой ошибки повторный запрос '
+            'отправляется через `RETRY_PERIOD`.'
+        )
+        second_delay = homework_module.get_retry_delay(1)
+        assert (
+            2 * self.RETRY_PERIOD
+            <= second_delay
+            <= 2 * self.RETRY_PERIOD + homework_module.RETRY_JITTER
+        ), (
+            'Убедитесь, что пауза после повторной ошибки удваивается '
+            'с добавлением случайного смещения.'
+        )
+        for attempt in range(2, 10):
+            assert (
+                homework_module.get_retry_delay(attempt)
+                <= homework_module.MAX_RETRY_PERIOD
+            ), (
+                'Убедитесь, что пауза не превышает `MAX_RETRY_PERIOD`.'
+            )
+        assert (
+            homework_module.get_retry_delay(5000)
+            <= homework_module.MAX_RETRY_PERIOD
+        ), (
+            'Убедитесь, что пауза рассчитывается и при очень большом '
+            'числе ошибок подряд.'
+        )
+        assert homework_module.get_retry_delay(0, 5000) == 5000, (
+            'Убедитесь, что пауза не короче значения `Retry-After`.'
+        )
+        assert (
+            homework_module.get_retry_delay(0, 10) == self.RETRY_PERIOD
+        ), (
+            'Убедитесь, что `Retry-After` не сокращает паузу '
+            'меньше `RETRY_PERIOD`.'
+        )
+
+    def test_get_api_answer_too_many_requests(self, monkeypatch,
+                                              current_timestamp,
+                                              homework_module):
+        def mock_response_get(*args, **kwargs):
+            return utils.MockResponseGET(
+                *args, http_status=HTTPStatus.TOO_MANY_REQUESTS,
+                response_headers={'Retry-After': '1200'}, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        with pytest.raises(exceptions.TooManyRequestsError) as error:
+            homework_module.get_api_answer(current_timestamp)
+        assert error.value.retry_after == 1200, (
+            'Убедитесь, что при ответе 429 значение заголовка '
+            '`Retry-After` передаётся в исключении.'
+        )
+
+    def test_main_backoff_only_for_api_errors(self, monkeypatch,
+                                              random_timestamp,
+                                              homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        delays = []
+
+        def mock_sleep(secs):
+            delays.append(secs)
+            if len(delays) == 2:
+                raise utils.BreakInfiniteLoop('break')
+
+        def mock_check_response(response):
+            raise TypeError('Ответ API не является словарем.')
+
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        monkeypatch.setattr(
+            requests, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp, HTTPStatus.OK, None
+            )
+        )
+        monkeypatch.setattr(
+            homework_module, 'check_response', mock_check_response
+        )
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert delays == [self.RETRY_PERIOD] * 2, (
+            'Убедитесь, что при ошибках, не связанных с запросом к API, '
+            'пауза между запросами не увеличивается.'
+        )
+
+        delays.clear()
+        monkeypatch.setattr(
+            requests, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp, HTTPStatus.INTERNAL_SERVER_ERROR, {}
+            )
+        )
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert delays[0] == self.RETRY_PERIOD, (
+            'Убедитесь, что после первой ошибки API повторный запрос '
+            'отправляется через `RETRY_PERIOD`.'
+        )
+        assert delays[1] > self.RETRY_PERIOD, (
+            'Убедитесь, что при повторных ошибках API пауза увеличивается.'
+        )
+
+        delays.clear()
+
+        def mock_too_many_requests(*args, **kwargs):
+            return utils.MockResponseGET(
+                *args, http_status=HTTPStatus.TOO_MANY_REQUESTS,
+                response_headers={'Retry-After': '5000'}, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_too_many_requests)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert delays[0] == 5000, (
+            'Убедитесь, что при ответе 429 пауза не короче `Retry-After`.'
+        )
+
+    def test_main_retries_after_failed_send(self, monkeypatch,
+                                            random_timestamp,
+                                            homework_module,
+                                            data_with_new_hw_status):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        requested_params = []
+        sent = []
+
+        def mock_response_get(*args, params=None, **kwargs):
+            requested_params.append(dict(params))
+            return utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                data=data_with_new_hw_status, **kwargs
+            )
+
+        class FailingOnceBot(utils.MockTelegramBot):
+            calls = 0
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                FailingOnceBot.calls += 1
+                if FailingOnceBot.calls == 1:
+                    raise telegram.error.TelegramError('Something wrong')
+                sent.append(text)
+
+        def mock_sleep(secs):
+            if len(requested_params) == 3:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(telegram, 'Bot', FailingOnceBot)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert requested_params[1] == requested_params[0], (
+            'Убедитесь, что после ошибки отправки временная метка '
+            '`from_date` не обновляется.'
+        )
+        verdict = self.HOMEWORK_VERDICTS['approved']
+        assert len(sent) == 1 and verdict in sent[0], (
+            'Убедитесь, что статус, который не удалось отправить, '
+            'отправляется при следующем запросе.'
+        )
+
+    @pytest.mark.parametrize('elapsed, expected_sleep', [
+        (7.9, 593),
+        (1000, 0),
+    ])
+    def test_main_sleep_subtracts_iteration_time(self, monkeypatch,
+                                                 random_timestamp,
+                                                 elapsed, expected_sleep,
+                                                 homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        monkeypatch.setattr(
+            requests, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp, HTTPStatus.OK, None
+            )
+        )
+        old_monotonic = time.monotonic
+        clock = iter((100.0, 100.0 + elapsed))
+        delays = []
+
+        def mock_monotonic():
+            if inspect.stack()[1].function != 'main':
+                return old_monotonic()
+            return next(clock)
+
+        def mock_sleep(secs):
+            delays.append(secs)
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(time, 'monotonic', mock_monotonic)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert delays == [expected_sleep], (
+            'Убедитесь, что из паузы между запросами вычитается время '
+            'выполнения итерации и пауза не бывает отрицательной.'
+        )
+
+    def test_sent_statuses_dedup(self, monkeypatch, homework_module):
+        sent_statuses = homework_module.OrderedDict()
+        homework = {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'}
+        assert homework_module.is_new_status(sent_statuses, homework), (
+            'Убедитесь, что статус новой работы считается новым.'
+        )
+        homework_module.remember_status(sent_statuses, homework)
+        assert not homework_module.is_new_status(sent_statuses, homework), (
+            'Убедитесь, что уже отправленный статус работы '
+            'не отправляется повторно.'
+        )
+        changed = dict(homework, status='approved')
+        assert homework_module.is_new_status(sent_statuses, changed), (
+            'Убедитесь, что изменившийся статус работы отправляется.'
+        )
+
+        monkeypatch.setattr(homework_module, 'SENT_STATUSES_LIMIT', 2)
+        for homework_id in (2, 3):
+            homework_module.remember_status(
+                sent_statuses,
+                {'id': homework_id, 'status': 'approved'}
+            )
+        assert list(sent_statuses) == [2, 3], (
+            'Убедитесь, что при превышении `SENT_STATUSES_LIMIT` '
+            'удаляется самая старая запись.'
+        )
+        assert homework_module.is_new_status(sent_statuses, homework), (
+            'Убедитесь, что вытесненная запись снова считается новой.'
+        )
+
+    def test_send_new_statuses_batches(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        sent = []
+
+        class RecordingBot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        homeworks = [
+            {'id': i, 'homework_name': 'hw' * 500, 'status': 'approved'}
+            for i in range(5)
+        ]
+        sent_statuses = homework_module.OrderedDict()
+        homework_module.send_new_statuses(
+            RecordingBot(), homeworks, sent_statuses
+        )
+        assert len(sent) == 2, (
+            'Убедитесь, что статусы отправляются минимумом сообщений.'
+        )
+        assert all(
+            len(text) <= homework_module.TELEGRAM_MESSAGE_LIMIT
+            for text in sent
+        ), (
+            'Убедитесь, что сообщение не превышает `TELEGRAM_MESSAGE_LIMIT`.'
+        )
+        assert sum(
+            text.count(self.HOMEWORK_VERDICTS['approved']) for text in sent
+        ) == len(homeworks), (
+            'Убедитесь, что в сообщения попадают статусы всех работ.'
+        )
+        assert list(sent_statuses) == list(range(5))
+
+    def test_send_new_statuses_skips_invalid_homework(self, monkeypatch,
+                                                      caplog,
+                                                      homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        bot = utils.MockTelegramBot()
+        homeworks = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'unknown'},
+            {'id': 3, 'status': 'approved'},
+        ]
+        sent_statuses = homework_module.OrderedDict()
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что ошибка обработки статуса работы '
+                'логируется с уровнем `ERROR`.'
+        )):
+            homework_module.send_new_statuses(bot, homeworks, sent_statuses)
+        assert bot.text and 'hw1' in bot.text, (
+            'Убедитесь, что корректные статусы отправляются, даже если '
+            'статус другой работы не удалось обработать.'
+        )
+        assert list(sent_statuses) == [1], (
+            'Убедитесь, что сохраняются только отправленные статусы.'
+        )
+
+    def test_send_new_statuses_failed_batch(self, monkeypatch,
+                                            homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+
+        class FailingSecondBot(utils.MockTelegramBot):
+            calls = 0
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                FailingSecondBot.calls += 1
+                if FailingSecondBot.calls == 2:
+                    raise telegram.error.TelegramError('Something wrong')
+
+        homeworks = [
+            {'id': i, 'homework_name': 'hw' * 500, 'status': 'approved'}
+            for i in range(5)
+        ]
+        sent_statuses = homework_module.OrderedDict()
+        with pytest.raises(exceptions.SendMessageError):
+            homework_module.send_new_statuses(
+                FailingSecondBot(), homeworks, sent_statuses
+            )
+        assert list(sent_statuses) == [0, 1, 2], (
+            'Убедитесь, что после ошибки отправки сохраняются только '
+            'статусы из уже отправленных сообщений.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             utils.check_docstring(homework_module, func)
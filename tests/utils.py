@@ -84,11 +84,13 @@ class MockResponseGET:
     CALLED_LOG_MSG = 'Request is sent'
 
     def __init__(self, *args, random_timestamp=None,
-                 http_status=HTTPStatus.OK, data=None, **kwargs):
+                 http_status=HTTPStatus.OK, data=None,
+                 response_headers=None, **kwargs):
         self.random_timestamp = random_timestamp
         self.status_code = http_status
         self.reason = ''
         self.text = ''
+        self.headers = response_headers or {}
         default_data = {
             'homeworks': [],
             'current_date': self.random_timestamp